@@ -5,17 +5,53 @@ from __future__ import annotations
 
 import asyncio
 import json
+import multiprocessing
 import os
 import sys
-from typing import Any, Dict, List, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from apify import Actor
 
-from parser import build_session, parse_vehicle
+from parser import (
+    afetch_vehicle_page,
+    awarm_client,
+    build_async_client,
+    dump_json,
+    parse_html,
+    parse_vehicle,
+)
 
 
 # Limit how many parsed items we keep in OUTPUT to avoid blowing KV store for bulk runs.
 OUTPUT_ITEM_LIMIT = 20
+# Batches this large parse in worker processes; the GIL serializes parsing in threads.
+PROCESS_POOL_THRESHOLD = 50
+# Dataset pushes are batched to cut Apify API round-trips.
+PUSH_BATCH_SIZE = 10
+PUSH_BATCH_TIMEOUT = 0.25
+# cgroup v2 CPU quota; `docker --cpus` limits land here, not in the affinity mask.
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+
+def _cgroup_cpu_quota(path: str = CGROUP_CPU_MAX) -> Optional[int]:
+    """Whole CPUs granted by a cgroup v2 quota, or None when unlimited or unknown."""
+    try:
+        with open(path, encoding="ascii") as handle:
+            quota, period = handle.read().split()[:2]
+        return max(1, int(quota) // int(period))
+    except (OSError, ValueError):
+        return None  # No cgroup v2 file, or a "max" (unlimited) quota.
+
+
+def _usable_cpus() -> int:
+    """CPUs this process may actually use, after the affinity mask and cgroup quota."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    return cpus if quota is None else min(cpus, quota)
 
 
 def _coerce_vehicle_ids(payload: Dict[str, Any]) -> List[str]:
@@ -48,6 +84,13 @@ def _parse_max_concurrency(payload: Dict[str, Any]) -> int:
     return max(1, min(value, 10))
 
 
+def _configure_default_executor(max_concurrency: int) -> None:
+    """Size the `asyncio.to_thread` pool to our workers instead of min(32, cpu + 4)."""
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="encar")
+    )
+
+
 async def _process_vehicle_ids(
     vehicle_ids: List[str],
     html_path: Optional[str],
@@ -60,59 +103,120 @@ async def _process_vehicle_ids(
 
     total = len(vehicle_ids)
     worker_count = min(max_concurrency, total)
-    queue: asyncio.Queue[Optional[Tuple[int, str]]] = asyncio.Queue()
-    for idx, vehicle_id in enumerate(vehicle_ids):
-        queue.put_nowait((idx, vehicle_id))
-    for _ in range(worker_count):
-        queue.put_nowait(None)
+    # Bounded so IDs are fed lazily and producers wait on slow consumers.
+    queue: asyncio.Queue[Optional[Tuple[int, str]]] = asyncio.Queue(maxsize=max_concurrency * 2)
+    pushed: asyncio.Queue[Optional[Tuple[int, str, Dict[str, Any]]]] = asyncio.Queue()
 
-    results: List[Tuple[int, Dict[str, Any]]] = []
+    # Slots keep input order without a final sort; unfilled ones are dropped.
+    results: List[Optional[Dict[str, Any]]] = [None] * total
     failures: List[Tuple[str, str]] = []
     success_count = 0
+    stored = 0
     processed = 0
     last_status = 0
 
-    sessions = [None if html_path else build_session() for _ in range(worker_count)]
+    # Fetches are awaited natively; only the CPU-bound parse leaves the event loop.
+    client = None if html_path else build_async_client(max_concurrency)
+    loop = asyncio.get_running_loop()
+    # Worker processes only pay off with more than one usable core; fetches already
+    # cap in-flight parses at max_concurrency, so extra workers would sit idle.
+    cpus = _usable_cpus()
+    process_pool = (
+        ProcessPoolExecutor(
+            max_workers=min(max_concurrency, cpus),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        if total >= PROCESS_POOL_THRESHOLD and cpus > 1
+        else None
+    )
 
-    async def worker(worker_idx: int) -> None:
-        nonlocal success_count, processed, last_status
-        session = sessions[worker_idx]
+    async def run_parse(func: Callable[..., Dict[str, Any]], *args: Any) -> Dict[str, Any]:
+        if process_pool is None:
+            return await asyncio.to_thread(func, *args)
+        return await loop.run_in_executor(process_pool, func, *args)
+
+    async def producer() -> None:
+        for queued in enumerate(vehicle_ids):
+            await queue.put(queued)
+        for _ in range(worker_count):
+            await queue.put(None)
+
+    async def worker() -> None:
+        nonlocal success_count, stored, processed, last_status
+        while True:
+            queued = await queue.get()
+            if queued is None:
+                break
+            order_idx, vehicle_id = queued
+            try:
+                if client is None:
+                    result = await run_parse(parse_vehicle, vehicle_id, html_path)
+                else:
+                    html = await afetch_vehicle_page(vehicle_id, client)
+                    result = await run_parse(parse_html, html, vehicle_id)
+                success_count += 1
+                if store_limit is None or stored < store_limit:
+                    results[order_idx] = result
+                    stored += 1
+                if push_to_dataset:
+                    await pushed.put((order_idx, vehicle_id, result))
+            except Exception as exc:  # noqa: BLE001
+                failures.append((vehicle_id, str(exc)))
+            finally:
+                processed += 1
+                if push_to_dataset and processed - last_status >= 5:
+                    last_status = processed
+                    update_fn = getattr(Actor, "update_status_message", None)
+                    if update_fn:
+                        await update_fn(f"Processed {processed}/{total} vehicles")
+
+    async def flush(batch: List[Tuple[int, str, Dict[str, Any]]]) -> None:
+        """Push one batch; on failure its vehicles become failures, not successes."""
+        nonlocal success_count
         try:
-            while True:
-                queued = await queue.get()
-                if queued is None:
-                    queue.task_done()
-                    break
-                order_idx, vehicle_id = queued
-                try:
-                    result = await asyncio.to_thread(
-                        parse_vehicle, vehicle_id, html_path=html_path, session=session
-                    )
-                    success_count += 1
-                    if store_limit is None or len(results) < store_limit:
-                        results.append((order_idx, result))
-                    if push_to_dataset:
-                        await Actor.push_data(result)
-                except Exception as exc:  # noqa: BLE001
-                    failures.append((vehicle_id, str(exc)))
-                finally:
-                    processed += 1
-                    if push_to_dataset and processed - last_status >= 5:
-                        last_status = processed
-                        update_fn = getattr(Actor, "update_status_message", None)
-                        if update_fn:
-                            await update_fn(f"Processed {processed}/{total} vehicles")
-                    queue.task_done()
-        finally:
-            if session is not None:
-                session.close()
-
-    workers = [asyncio.create_task(worker(idx)) for idx in range(worker_count)]
-    await queue.join()
-    await asyncio.gather(*workers)
-
-    # Restore input order for stored results/preview.
-    ordered_results = [item for _, item in sorted(results, key=lambda pair: pair[0])]
+            await Actor.push_data([result for _, _, result in batch])
+        except Exception as exc:  # noqa: BLE001
+            for order_idx, vehicle_id, _ in batch:
+                success_count -= 1
+                results[order_idx] = None
+                failures.append((vehicle_id, f"Dataset push failed: {exc}"))
+
+    async def aggregator() -> None:
+        """Push dataset items in batches, flushing early when results trickle in."""
+        batch: List[Tuple[int, str, Dict[str, Any]]] = []
+        finished = False
+        while not finished:
+            try:
+                item = await asyncio.wait_for(pushed.get(), timeout=PUSH_BATCH_TIMEOUT)
+            except asyncio.TimeoutError:
+                if batch:
+                    await flush(batch)
+                    batch = []
+                continue
+            if item is None:
+                finished = True
+            else:
+                batch.append(item)
+            if batch and (finished or len(batch) >= PUSH_BATCH_SIZE):
+                await flush(batch)
+                batch = []
+
+    aggregator_task = asyncio.create_task(aggregator()) if push_to_dataset else None
+    try:
+        if client is not None:
+            # HTTP/2 multiplexes all workers over this one warmed-up connection.
+            await awarm_client(client)
+        await asyncio.gather(producer(), *(worker() for _ in range(worker_count)))
+    finally:
+        if aggregator_task is not None:
+            await pushed.put(None)
+            await aggregator_task
+        if client is not None:
+            await client.aclose()
+        if process_pool is not None:
+            process_pool.shutdown()
+
+    ordered_results = [item for item in results if item is not None]
 
     return ordered_results, success_count, failures
 
@@ -125,6 +229,7 @@ async def main() -> None:
             vehicle_ids = _coerce_vehicle_ids(payload)
             html_path = payload.get("htmlPath")
             max_concurrency = _parse_max_concurrency(payload)
+            _configure_default_executor(max_concurrency)
 
             if not vehicle_ids:
                 await Actor.fail("Input must contain `vehicleId` or `vehicleIds`.") # pyright: ignore[reportCallIssue]
@@ -169,6 +274,7 @@ async def main() -> None:
         vehicle_ids = _coerce_vehicle_ids(payload)
         html_path = payload.get("htmlPath") or _cli_html_path(sys.argv[1:])
         max_concurrency = _parse_max_concurrency(payload)
+        _configure_default_executor(max_concurrency)
         if not vehicle_ids:
             raise SystemExit("Input must contain `vehicleId` or `vehicleIds`.")
         results, success_count, failures = await _process_vehicle_ids(
@@ -184,8 +290,7 @@ async def main() -> None:
             )
         output: Union[List[Dict[str, Any]], Dict[str, Any]]
         output = results if len(vehicle_ids) > 1 else (results[0] if results else {})
-        json.dump(output, sys.stdout, ensure_ascii=False, indent=2)
-        sys.stdout.write("\n")
+        sys.stdout.buffer.write(dump_json(output))
 
 
 if __name__ == "__main__":
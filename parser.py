@@ -13,200 +13,259 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
+import mmap
+import os
+import re
+import socket
 import sys
-from html.parser import HTMLParser
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from importlib.util import find_spec
+from types import MappingProxyType
+from typing import Any, Dict, Final, List, Mapping, Optional, Tuple, Union
 
+import httpx
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader
 from urllib3.util.retry import Retry
-from unidecode import unidecode
-from pydantic import BaseModel, ConfigDict, ValidationError
+from anyascii import anyascii
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - listed in requirements; stdlib keeps the CLI usable.
+    orjson = None  # type: ignore[assignment]
 
 USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_0) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
     "Chrome/107.0.0.0 Safari/537.36"
 )
-HEADERS = {
-    "User-Agent": USER_AGENT,
-    "Accept-Language": "en-US,en;q=0.9,ko;q=0.8",
-}
+# requests/httpx only decode `br` with one of these installed; never advertise it otherwise.
+_HAS_BROTLI = any(find_spec(name) is not None for name in ("brotli", "brotlicffi"))
+# Shared by every session/client; read-only so no caller can mutate it in place.
+HEADERS: Final = MappingProxyType(
+    {
+        "User-Agent": USER_AGENT,
+        "Accept-Language": "en-US,en;q=0.9,ko;q=0.8",
+        # Pages are multi-hundred-KB HTML; both clients decompress transparently.
+        "Accept-Encoding": "br, gzip, deflate" if _HAS_BROTLI else "gzip, deflate",
+    }
+)
+VEHICLE_URL_PREFIX = "https://fem.encar.com/cars/detail/"
 REQUEST_TIMEOUT = 15
-RETRY_STRATEGY = Retry(
-    total=3,
+RETRY_ATTEMPTS = 3  # Retries after the first try, for both the sync and async clients.
+RETRY_STRATEGY: Final = Retry(
+    total=RETRY_ATTEMPTS,
     backoff_factor=0.3,
     status_forcelist=(429, 500, 502, 503, 504),
     allowed_methods=("GET",),
 )
-SESSION = None  # Lazy-initialized shared session for connection reuse.
+POOL_SIZE = 32  # Keep-alive connections per host for the shared requests session.
+# Small GETs must not wait on Nagle; keepalive probes stop idle pooled sockets dying silently.
+SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
 MAX_STATE_CHARS = 5_000_000  # Safety guard for unexpected script bloat.
+# cars.base sections that build_output relies on; each must be a JSON object.
+REQUIRED_BASE_SECTIONS = ("category", "advertisement", "spec", "manage", "condition")
+# JSON string literals (with escapes) or a single brace; used to match the state object.
+_JSON_TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}]', re.DOTALL)
+# Fast path for the usual `__PRELOADED_STATE__ = {...};</script>` layout; anchoring
+# on the closing tag keeps `};` inside string values from ending the match.
+_PRELOADED_RE = re.compile(
+    rb"__PRELOADED_STATE__\s*=\s*(\{.*?\})\s*;?\s*</script>", re.DOTALL
+)
+_ASSIGNMENT_RE = re.compile(rb"\s*=\s*\{")
+_OPEN_BRACE = ord("{")
+_CLOSE_BRACE = ord("}")
+# Shared stand-in for absent/null sub-objects in build_output; read-only.
+_EMPTY: Final[Mapping[str, Any]] = MappingProxyType({})
 
 
-class CategoryModel(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-
-    manufacturerEnglishName: Optional[str] = None
-    manufacturerName: Optional[str] = None
-    modelGroupEnglishName: Optional[str] = None
-    modelGroupName: Optional[str] = None
-    modelName: Optional[str] = None
-    gradeEnglishName: Optional[str] = None
-    gradeName: Optional[str] = None
-    yearMonth: Optional[str] = None
-    formYear: Optional[int] = None
-
-
-class AdvertisementModel(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-
-    price: Optional[int] = None
-    advertisementType: Optional[str] = None
-    status: Optional[str] = None
-    diagnosisCar: Optional[bool] = None
-
-
-class SpecModel(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-
-    displacement: Optional[int] = None
-    transmissionName: Optional[str] = None
-    fuelCd: Optional[str] = None
-    fuelName: Optional[str] = None
-    colorName: Optional[str] = None
-    seatCount: Optional[int] = None
-    bodyName: Optional[str] = None
-    mileage: Optional[int] = None
-
-
-class ManageModel(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-
-    registDateTime: Optional[str] = None
-    firstAdvertisedDateTime: Optional[str] = None
-    modifyDateTime: Optional[str] = None
-    subscribeCount: Optional[int] = None
-    viewCount: Optional[int] = None
-
-
-class ConditionModel(BaseModel):
-    model_config = ConfigDict(extra="ignore")
-
-    accident: Optional[Dict[str, Any]] = None
-    inspection: Optional[Dict[str, Any]] = None
-    seizing: Optional[Dict[str, Any]] = None
-
+def _loads(data: Union[bytes, memoryview, str]) -> Any:
+    """Decode JSON, in place from a memoryview when orjson is available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
 
-class DetailFlagsModel(BaseModel):
-    model_config = ConfigDict(extra="ignore")
 
-    adStatus: Optional[str] = None
+def dump_json(obj: Any) -> bytes:
+    """Serialize `obj` as indented UTF-8 JSON with a trailing newline."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+        )
+    return (json.dumps(obj, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
 
 
-class BaseCarModel(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+class EncarParseError(Exception):
+    """Raised when the Encar page cannot be parsed."""
 
-    vehicleId: Optional[int] = None
-    vin: Optional[str] = None
-    category: CategoryModel
-    advertisement: AdvertisementModel
-    spec: SpecModel
-    manage: ManageModel
-    condition: ConditionModel
-    detailFlags: Optional[DetailFlagsModel] = None
 
+class _SocketOptionsAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections use `SOCKET_OPTIONS`."""
 
-class EncarParseError(Exception):
-    """Raised when the Encar page cannot be parsed."""
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("socket_options", SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
 
 
 def build_session() -> requests.Session:
     """Return a configured session with retries."""
     session = requests.Session()
-    adapter = HTTPAdapter(max_retries=RETRY_STRATEGY)
+    adapter = _SocketOptionsAdapter(
+        pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=RETRY_STRATEGY
+    )
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     session.headers.update(HEADERS)
+    session.headers["Connection"] = "keep-alive"
     return session
 
 
-def fetch_vehicle_page(vehicle_id: str, session: Optional[requests.Session] = None) -> str:
+SESSION = build_session()  # Shared by all callers that do not pass their own session.
+
+
+def build_async_client(max_connections: int) -> httpx.AsyncClient:
+    """Return an HTTP/2 async client meant to be shared by all concurrent fetches."""
+    limits = httpx.Limits(
+        max_connections=max_connections, max_keepalive_connections=max_connections
+    )
+    # The transport owns pooling/HTTP/2; client-level limits are ignored once it is set.
+    transport = httpx.AsyncHTTPTransport(
+        http2=True, limits=limits, retries=RETRY_ATTEMPTS, socket_options=SOCKET_OPTIONS
+    )
+    # requests follows redirects by default, httpx does not; keep the session's behaviour.
+    return httpx.AsyncClient(
+        headers=HEADERS, timeout=REQUEST_TIMEOUT, transport=transport, follow_redirects=True
+    )
+
+
+async def awarm_client(client: httpx.AsyncClient) -> None:
+    """Open the Encar connection (DNS, TCP, TLS) before the first real fetch.
+
+    Best effort: failures are ignored, the real fetches retry on their own.
+    """
+    try:
+        await client.head("https://fem.encar.com/", timeout=5)
+    except httpx.HTTPError:
+        pass
+
+
+def fetch_vehicle_page(vehicle_id: str, session: Optional[requests.Session] = None) -> bytes:
     """Download the vehicle detail page HTML."""
-    url = f"https://fem.encar.com/cars/detail/{vehicle_id}"
-    global SESSION
-    if session:
-        sess = session
-    else:
-        if SESSION is None:
-            SESSION = build_session()
-        sess = SESSION
+    url = f"{VEHICLE_URL_PREFIX}{vehicle_id}"
+    sess = session or SESSION
     response = sess.get(url, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
-    return response.text
-
-
-def extract_preloaded_state(html: str) -> Dict[str, Any]:
-    """Extract the __PRELOADED_STATE__ JSON blob embedded in the page."""
-    marker = "__PRELOADED_STATE__"
-
-    class _ScriptCollector(HTMLParser):
-        def __init__(self) -> None:
-            super().__init__()
-            self.scripts: List[str] = []
-            self._in_script = False
-            self._buffer: List[str] = []
-
-        def handle_starttag(self, tag: str, attrs: List[tuple[str, Optional[str]]]) -> None:
-            if tag.lower() == "script":
-                self._in_script = True
-                self._buffer = []
-
-        def handle_endtag(self, tag: str) -> None:
-            if tag.lower() == "script" and self._in_script:
-                combined = "".join(self._buffer)
-                if marker in combined:
-                    self.scripts.append(combined)
-                self._in_script = False
-                self._buffer = []
-
-        def handle_data(self, data: str) -> None:
-            if self._in_script:
-                self._buffer.append(data)
-
-    parser = _ScriptCollector()
-    parser.feed(html)
-    candidates = parser.scripts
-    if not candidates:
-        raise EncarParseError("Preloaded state marker not found.")
+    return response.content
 
-    def _extract_json(script_body: str) -> Dict[str, Any]:
-        _, _, tail = script_body.partition(marker)
-        _, _, after_equals = tail.partition("=")
-        json_start = after_equals.find("{")
-        if json_start == -1:
-            raise EncarParseError("Preloaded state JSON payload not found.")
-        json_blob = after_equals[json_start:]
-        # Trim trailing semicolon or extra script text.
-        json_blob = json_blob.split("</script>", 1)[0].strip()
-        if ";" in json_blob:
-            json_blob = json_blob.split(";", 1)[0].strip()
-        if len(json_blob) > MAX_STATE_CHARS:
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying `response`, honouring Retry-After like urllib3."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None and response.status_code in Retry.RETRY_AFTER_STATUS_CODES:
+        try:
+            return RETRY_STRATEGY.parse_retry_after(retry_after)
+        except InvalidHeader:
+            pass  # Unparseable header; fall back to exponential backoff.
+    return RETRY_STRATEGY.backoff_factor * (2**attempt)
+
+
+async def afetch_vehicle_page(vehicle_id: str, client: httpx.AsyncClient) -> bytes:
+    """Download the vehicle detail page HTML without blocking the event loop."""
+    url = f"{VEHICLE_URL_PREFIX}{vehicle_id}"
+    # The transport only retries connection errors; mirror RETRY_STRATEGY for statuses.
+    for attempt in range(RETRY_ATTEMPTS + 1):
+        response = await client.get(url)
+        if (
+            response.status_code not in RETRY_STRATEGY.status_forcelist
+            or attempt == RETRY_ATTEMPTS
+        ):
+            break
+        await asyncio.sleep(_retry_delay(response, attempt))
+    response.raise_for_status()
+    return response.content
+
+
+def _find_object_end(html: Union[bytes, mmap.mmap], start: int, limit: int) -> int:
+    """Return the index just past the JSON object opening at `start`, or -1.
+
+    Braces are counted outside of string literals only; strings (including
+    escaped quotes) are skipped whole by the token regex.
+    """
+    depth = 0
+    for token in _JSON_TOKEN_RE.finditer(html, start, limit):
+        char = html[token.start()]
+        if char == _OPEN_BRACE:
+            depth += 1
+        elif char == _CLOSE_BRACE:
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    return -1
+
+
+def _decode_state_at(html: Union[bytes, mmap.mmap], offset: int) -> Dict[str, Any]:
+    """Decode the JSON object assigned right after the marker ending at `offset`."""
+    # Every search is bounded by the enclosing script; nothing is sliced until decode.
+    script_end = html.find(b"</script>", offset)
+    if script_end == -1:
+        script_end = len(html)
+    # Only a direct `marker = {` assignment counts; reads like `marker || {}` are skipped.
+    assignment = _ASSIGNMENT_RE.match(html, offset, script_end)
+    if assignment is None:
+        raise EncarParseError("Preloaded state JSON payload not found.")
+    json_start = assignment.end() - 1
+    limit = min(script_end, json_start + MAX_STATE_CHARS)
+    json_end = _find_object_end(html, json_start, limit)
+    if json_end == -1:
+        if limit < script_end:
             raise EncarParseError("Preloaded state payload too large.")
+        raise EncarParseError("Preloaded state JSON payload is not terminated.")
+    try:
+        # Release the view before any error propagates so a mapped page can be closed.
+        with memoryview(html)[json_start:json_end] as view:
+            return _loads(view)
+    except json.JSONDecodeError as exc:
+        raise EncarParseError(f"Failed to decode preloaded state: {exc}") from exc
+
+
+def extract_preloaded_state(html: Union[bytes, mmap.mmap, str]) -> Dict[str, Any]:
+    """Extract the __PRELOADED_STATE__ JSON blob embedded in the page.
+
+    Works on the raw page bytes (or a memory-mapped file); `str` input is
+    encoded to UTF-8 first.
+    """
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    match = _PRELOADED_RE.search(html)
+    if match is not None and match.end(1) - match.start(1) <= MAX_STATE_CHARS:
         try:
-            return json.loads(json_blob)
-        except json.JSONDecodeError as exc:
-            raise EncarParseError(f"Failed to decode preloaded state: {exc}") from exc
+            with memoryview(html)[match.start(1) : match.end(1)] as view:
+                return _loads(view)
+        except json.JSONDecodeError:
+            pass  # More statements follow in the same script; brace-match instead.
+
+    marker = b"__PRELOADED_STATE__"
+    idx = html.find(marker)
+    if idx == -1:
+        raise EncarParseError("Preloaded state marker not found.")
 
-    # Use first valid candidate; fail only after trying all.
-    last_error: Optional[Exception] = None
-    for script in candidates:
+    # Use first valid occurrence; fail only after trying all.
+    last_error: Optional[EncarParseError] = None
+    while idx != -1:
+        idx += len(marker)
         try:
-            return _extract_json(script)
+            return _decode_state_at(html, idx)
         except EncarParseError as exc:
             last_error = exc
-            continue
+        idx = html.find(marker, idx)
     raise EncarParseError(str(last_error) if last_error else "Failed to decode preloaded state.")
 
 
@@ -217,177 +276,206 @@ def normalize_price(raw_price: Optional[int]) -> Optional[int]:
     return int(raw_price) * 10_000
 
 
+@lru_cache(maxsize=128)
 def format_engine(displacement_cc: Optional[int]) -> Optional[str]:
     """Return a human-readable engine displacement string."""
     if displacement_cc in (None, 0):
         return None
-    liters = displacement_cc / 1000
-    trimmed = f"{liters:.1f}".rstrip("0").rstrip(".")
-    return f"{trimmed}L"
+    # Round to tenths of a litre with integer math: 1998 -> "2L", 2497 -> "2.5L".
+    whole, tenth = divmod((int(displacement_cc) + 50) // 100, 10)
+    return f"{whole}.{tenth}L" if tenth else f"{whole}L"
+
+
+_TRANSMISSION_MAP = {"오토": "Automatic", "수동": "Manual"}
+_FUEL_MAP = {
+    "가솔린": "Gasoline",
+    "디젤": "Diesel",
+    "하이브리드": "Hybrid",
+    "전기": "Electric",
+    "LPG": "LPG",
+}
+_FUEL_CODE_MAP = {
+    "001": "Gasoline",
+    "002": "Diesel",
+    "003": "LPG",
+    "004": "Electric",
+    "005": "Hybrid",
+    "006": "Hydrogen",
+}
+_COLOR_MAP = {
+    "검정색": "Black",
+    "흰색": "White",
+    "화이트": "White",
+    "은색": "Silver",
+    "회색": "Gray",
+    "빨간색": "Red",
+    "파란색": "Blue",
+    "청색": "Blue",
+    "초록색": "Green",
+    "갈색": "Brown",
+    "베이지": "Beige",
+    "노란색": "Yellow",
+    "주황색": "Orange",
+}
 
 
+@lru_cache(maxsize=512)
 def translate_transmission(value: Optional[str]) -> Optional[str]:
-    mapping = {"오토": "Automatic", "수동": "Manual"}
     if not value:
         return None
     value = value.strip()
-    return mapping.get(value, value)
+    return _TRANSMISSION_MAP.get(value, value)
 
 
+@lru_cache(maxsize=512)
 def translate_fuel(value: Optional[str]) -> Optional[str]:
-    mapping = {
-        "가솔린": "Gasoline",
-        "디젤": "Diesel",
-        "하이브리드": "Hybrid",
-        "전기": "Electric",
-        "LPG": "LPG",
-    }
     if not value:
         return None
     value = value.strip()
-    return mapping.get(value, value)
+    return _FUEL_MAP.get(value, value)
 
 
-def classify_fuel(spec: Dict[str, Any]) -> Optional[str]:
+def classify_fuel(spec: Mapping[str, Any]) -> Optional[str]:
     """Return a normalized fuel category."""
-    code_map = {
-        "001": "Gasoline",
-        "002": "Diesel",
-        "003": "LPG",
-        "004": "Electric",
-        "005": "Hybrid",
-        "006": "Hydrogen",
-    }
-    if spec.get("fuelCd") in code_map:
-        return code_map[spec["fuelCd"]]
-    return translate_fuel(spec.get("fuelName"))
+    return _classify_fuel(spec.get("fuelCd"), spec.get("fuelName"))
 
 
-COLOR_MAP = {
-    "검정색": "Black",
-    "흰색": "White",
-    "화이트": "White",
-    "은색": "Silver",
-    "회색": "Gray",
-    "빨간색": "Red",
-    "파란색": "Blue",
-    "청색": "Blue",
-    "초록색": "Green",
-    "갈색": "Brown",
-    "베이지": "Beige",
-    "노란색": "Yellow",
-    "주황색": "Orange",
-}
+@lru_cache(maxsize=512)
+def _classify_fuel(fuel_cd: Optional[str], fuel_name: Optional[str]) -> Optional[str]:
+    if fuel_cd in _FUEL_CODE_MAP:
+        return _FUEL_CODE_MAP[fuel_cd]
+    return translate_fuel(fuel_name)
 
 
 def to_english(text: Optional[str]) -> Optional[str]:
     """Best-effort translation/transliteration to English."""
     if not text:
         return None
-    text = text.strip()
-    if text in COLOR_MAP:
-        return COLOR_MAP[text]
+    return _to_english(text.strip())
+
+
+@lru_cache(maxsize=4096)
+def _to_english(text: str) -> str:
+    # Keyed on stripped text so padding variants share one transliteration.
+    color = _COLOR_MAP.get(text)
+    if color is not None:
+        return color
     # If ASCII already, return as-is; else transliterate to Latin.
-    try:
-        text.encode("ascii")
+    if text.isascii():
         return text
-    except UnicodeEncodeError:
-        return unidecode(text)
+    return anyascii(text)
 
 
-def extract_year(category: Dict[str, Any]) -> Optional[int]:
-    if category.get("formYear"):
-        return int(category["formYear"])
-    year_month = str(category.get("yearMonth") or "")
-    if len(year_month) >= 4 and year_month[:4].isdigit():
-        return int(year_month[:4])
-    return None
+def extract_year(category: Mapping[str, Any]) -> Optional[int]:
+    # formYear is a plain year, yearMonth a YYYYMM int/str; both lead with the year.
+    year = str(category.get("formYear") or category.get("yearMonth") or "")
+    if len(year) < 4:
+        return None
+    try:
+        return int(year[:4])
+    except ValueError:
+        return None
 
 
+@lru_cache(maxsize=256)
 def format_date(date_str: Optional[str]) -> Optional[str]:
     """Return YYYY-MM-DD from an ISO datetime string."""
     if not date_str:
         return None
-    return date_str.split("T", 1)[0]
+    # ISO-8601 datetimes keep the date in the first 10 characters.
+    if date_str[10:11] == "T":
+        return date_str[:10]
+    sep = date_str.find("T")
+    return date_str if sep == -1 else date_str[:sep]
 
 
-def validate_state(state: Dict[str, Any]) -> BaseCarModel:
-    """Validate and normalize the expected cars.base structure."""
+def validate_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Check the expected cars.base structure and return the base object."""
     cars = state.get("cars")
     if not isinstance(cars, dict):
         raise EncarParseError("State missing `cars` object.")
     base = cars.get("base")
     if not isinstance(base, dict):
         raise EncarParseError("State missing `cars.base` object.")
-    try:
-        return BaseCarModel.model_validate(base)
-    except ValidationError as exc:
-        errors = exc.errors()
-        formatted = [
-            f"{err.get('msg')} @ {'/'.join(str(loc) for loc in err.get('loc', []))}"
-            for err in errors[:3]
-        ]
-        suffix = "; ".join(formatted)
-        raise EncarParseError(f"cars.base validation failed: {suffix}") from exc
-
-
-def build_output(vehicle_id: str, state: Dict[str, Any]) -> Dict[str, Any]:
-    base = state.get("cars", {}).get("base", {})
-    category = base.get("category", {})
-    advertisement = base.get("advertisement", {})
-    spec = base.get("spec", {})
-    manage = base.get("manage", {})
-    condition_base = base.get("condition", {})
-
-    specifications = {
-        "engine": format_engine(spec.get("displacement")),
-        "transmission": translate_transmission(spec.get("transmissionName")),
-        "fuel_type": classify_fuel(spec),
-        "color": to_english(spec.get("colorName")),
-        "body_type": spec.get("bodyName"),
-        "seats": spec.get("seatCount"),
-    }
-    specifications = {k: v for k, v in specifications.items() if v is not None}
-
-    timestamps = {
-        "registered_at": format_date(manage.get("registDateTime")),
-        "first_advertised_at": format_date(manage.get("firstAdvertisedDateTime")),
-        "modified_at": format_date(manage.get("modifyDateTime")),
-    }
-    timestamps = {k: v for k, v in timestamps.items() if v}
-
-    metrics = {
-        "view_count": manage.get("viewCount"),
-        "favorite_count": manage.get("subscribeCount"),
-        "ad_type": advertisement.get("advertisementType"),
-        "ad_status": base.get("detailFlags", {}).get("adStatus") or advertisement.get("status"),
-        "diagnosis_car": advertisement.get("diagnosisCar"),
-    }
-    metrics = {k: v for k, v in metrics.items() if v is not None}
-
-    condition = {
-        "accident_record_view": condition_base.get("accident", {}).get("recordView"),
-        "inspection_formats": condition_base.get("inspection", {}).get("formats"),
-        "seizing_count": condition_base.get("seizing", {}).get("seizingCount"),
-        "pledge_count": condition_base.get("seizing", {}).get("pledgeCount"),
-    }
-    condition = {k: v for k, v in condition.items() if v is not None}
-
-    data = {
-        "id": str(base.get("vehicleId") or vehicle_id),
-        "vin": base.get("vin"),
-        "make": category.get("manufacturerEnglishName") or category.get("manufacturerName"),
-        "model": category.get("modelGroupEnglishName")
+    missing = [key for key in REQUIRED_BASE_SECTIONS if not isinstance(base.get(key), dict)]
+    if missing:
+        suffix = "; ".join(f"Expected an object @ {key}" for key in missing[:3])
+        raise EncarParseError(f"cars.base validation failed: {suffix}")
+    return base
+
+
+def _put(target: Dict[str, Any], key: str, value: Any) -> None:
+    """Set `key` only when a value is present, keeping output free of nulls."""
+    if value is not None:
+        target[key] = value
+
+
+def _object(parent: Mapping[str, Any], key: str) -> Mapping[str, Any]:
+    """Return a nested object, treating absent or wrongly typed values as empty."""
+    value = parent.get(key)
+    return value if isinstance(value, dict) else _EMPTY
+
+
+def build_output(vehicle_id: str, base: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a validated cars.base object (see `validate_state`)."""
+    category = _object(base, "category")
+    advertisement = _object(base, "advertisement")
+    spec = _object(base, "spec")
+    manage = _object(base, "manage")
+    condition_base = _object(base, "condition")
+    seizing = _object(condition_base, "seizing")
+    fuel = classify_fuel(spec)
+
+    specifications: Dict[str, Any] = {}
+    _put(specifications, "engine", format_engine(spec.get("displacement")))
+    _put(specifications, "transmission", translate_transmission(spec.get("transmissionName")))
+    _put(specifications, "fuel_type", fuel)
+    _put(specifications, "color", to_english(spec.get("colorName")))
+    _put(specifications, "body_type", spec.get("bodyName"))
+    _put(specifications, "seats", spec.get("seatCount"))
+
+    timestamps: Dict[str, Any] = {}
+    _put(timestamps, "registered_at", format_date(manage.get("registDateTime")))
+    _put(timestamps, "first_advertised_at", format_date(manage.get("firstAdvertisedDateTime")))
+    _put(timestamps, "modified_at", format_date(manage.get("modifyDateTime")))
+
+    metrics: Dict[str, Any] = {}
+    _put(metrics, "view_count", manage.get("viewCount"))
+    _put(metrics, "favorite_count", manage.get("subscribeCount"))
+    _put(metrics, "ad_type", advertisement.get("advertisementType"))
+    _put(
+        metrics,
+        "ad_status",
+        _object(base, "detailFlags").get("adStatus") or advertisement.get("status"),
+    )
+    _put(metrics, "diagnosis_car", advertisement.get("diagnosisCar"))
+
+    condition: Dict[str, Any] = {}
+    accident = _object(condition_base, "accident")
+    inspection = _object(condition_base, "inspection")
+    _put(condition, "accident_record_view", accident.get("recordView"))
+    _put(condition, "inspection_formats", inspection.get("formats"))
+    _put(condition, "seizing_count", seizing.get("seizingCount"))
+    _put(condition, "pledge_count", seizing.get("pledgeCount"))
+
+    data: Dict[str, Any] = {"id": str(base.get("vehicleId") or vehicle_id)}
+    _put(data, "vin", base.get("vin"))
+    _put(data, "make", category.get("manufacturerEnglishName") or category.get("manufacturerName"))
+    _put(
+        data,
+        "model",
+        category.get("modelGroupEnglishName")
         or category.get("modelGroupName")
         or category.get("modelName"),
-        "trim": category.get("gradeEnglishName") or category.get("gradeName"),
-        "year": extract_year(category),
-        "price": normalize_price(advertisement.get("price")),
-        "mileage": spec.get("mileage"),
-        "fuel": classify_fuel(spec),
-        "url": f"https://fem.encar.com/cars/detail/{vehicle_id}",
-        "card_url": f"https://fem.encar.com/cars/detail/{vehicle_id}",
-    }
+    )
+    _put(data, "trim", category.get("gradeEnglishName") or category.get("gradeName"))
+    _put(data, "year", extract_year(category))
+    _put(data, "price", normalize_price(advertisement.get("price")))
+    _put(data, "mileage", spec.get("mileage"))
+    _put(data, "fuel", fuel)
+    url = f"{VEHICLE_URL_PREFIX}{vehicle_id}"
+    data["url"] = url
+    data["card_url"] = url
 
     if specifications:
         data["specifications"] = specifications
@@ -398,20 +486,90 @@ def build_output(vehicle_id: str, state: Dict[str, Any]) -> Dict[str, Any]:
     if condition:
         data["condition"] = condition
 
-    return {k: v for k, v in data.items() if v is not None}
+    return data
+
+
+def _parse_saved_page(path: str, vehicle_id: str) -> Dict[str, Any]:
+    """Parse a saved page through a read-only memory map scoped to this call.
+
+    The page is never copied onto the heap; only the JSON slice reaches orjson.
+    Mapping per call means a file rewritten between calls is always read fresh.
+    """
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return parse_html(b"", vehicle_id)  # mmap rejects empty files.
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as page:
+            return parse_html(page, vehicle_id)
+
+
+def parse_html(html: Union[bytes, mmap.mmap, str], vehicle_id: str) -> Dict[str, Any]:
+    """Parse an already-downloaded detail page into the output envelope."""
+    state = extract_preloaded_state(html)
+    base = validate_state(state)
+    # Only page values can fail here; vehicle_id is only ever interpolated into strings.
+    try:
+        data = build_output(vehicle_id, base)
+    except (TypeError, ValueError, AttributeError) as exc:
+        raise EncarParseError(f"Unexpected value in cars.base: {exc}") from exc
+    return {"data": data}
 
 
 def parse_vehicle(
     vehicle_id: str, html_path: Optional[str] = None, session: Optional[requests.Session] = None
 ) -> Dict[str, Any]:
-    html = (
-        Path(html_path).read_text(encoding="utf-8")
-        if html_path
-        else fetch_vehicle_page(vehicle_id, session=session)
-    )
-    state = extract_preloaded_state(html)
-    validate_state(state)
-    return {"data": build_output(vehicle_id, state)}
+    if html_path:
+        return _parse_saved_page(html_path, vehicle_id)
+    return parse_html(fetch_vehicle_page(vehicle_id, session=session), vehicle_id)
+
+
+async def parse_vehicles(
+    vehicle_ids: List[str],
+    concurrency: int = POOL_SIZE,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[Union[Dict[str, Any], BaseException]]:
+    """Fetch and parse many vehicles concurrently over one HTTP/2 client.
+
+    Results follow the input order; a vehicle that failed yields its exception
+    instead of a result, like `asyncio.gather(..., return_exceptions=True)`.
+    A `client` passed in is used as is and left open for the caller.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _parse_one(client: httpx.AsyncClient, vehicle_id: str) -> Dict[str, Any]:
+        async with semaphore:
+            html = await afetch_vehicle_page(vehicle_id, client)
+        return await asyncio.to_thread(parse_html, html, vehicle_id)
+
+    async def _parse_all(
+        client: httpx.AsyncClient,
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        return await asyncio.gather(
+            *(_parse_one(client, vehicle_id) for vehicle_id in vehicle_ids),
+            return_exceptions=True,
+        )
+
+    if client is not None:
+        return await _parse_all(client)
+    async with build_async_client(concurrency) as owned:
+        return await _parse_all(owned)
+
+
+def _parse_saved(item: Tuple[str, str]) -> Dict[str, Any]:
+    vehicle_id, html_path = item
+    return parse_vehicle(vehicle_id, html_path=html_path)
+
+
+def parse_many(
+    items: List[Tuple[str, str]], max_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Parse saved pages given as `(vehicle_id, html_path)` pairs in worker processes.
+
+    Results follow the input order; the first failure is raised. Workers use the
+    platform's default start method; where that is spawn or forkserver (macOS,
+    Windows, Python 3.14+), call this under an `if __name__ == "__main__":` guard.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_parse_saved, items, chunksize=16))
 
 
 def main(argv: Optional[list[str]] = None) -> None:
@@ -420,7 +578,7 @@ def main(argv: Optional[list[str]] = None) -> None:
     args = parser.parse_args(argv)
 
     try:
-        payload = json.load(sys.stdin)
+        payload = _loads(sys.stdin.buffer.read())
     except json.JSONDecodeError as exc:
         raise SystemExit(f"Invalid input JSON: {exc}") from exc
 
@@ -435,8 +593,7 @@ def main(argv: Optional[list[str]] = None) -> None:
     except (requests.RequestException, EncarParseError) as exc:
         raise SystemExit(f"Failed to parse vehicle page: {exc}") from exc
 
-    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
-    sys.stdout.write("\n")
+    sys.stdout.buffer.write(dump_json(result))
 
 
 if __name__ == "__main__":
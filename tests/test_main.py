@@ -0,0 +1,94 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import mock
+
+import main
+
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_HTML = ROOT / "sample.html"
+
+
+class _StubActor:
+    """Records dataset pushes; optionally fails the first one."""
+
+    def __init__(self, fail_first_push: bool = False) -> None:
+        self.batches: List[List[Dict[str, Any]]] = []
+        self._fail_next = fail_first_push
+
+    async def push_data(self, batch: List[Dict[str, Any]]) -> None:
+        self.batches.append(batch)
+        if self._fail_next:
+            self._fail_next = False
+            raise RuntimeError("dataset unavailable")
+
+    async def update_status_message(self, message: str) -> None:
+        pass
+
+
+def _run(actor: _StubActor, vehicle_ids: List[str]) -> Any:
+    # A long flush timeout keeps batch boundaries deterministic.
+    with mock.patch.object(main, "Actor", actor), mock.patch.object(
+        main, "PUSH_BATCH_TIMEOUT", 60
+    ):
+        return asyncio.run(
+            main._process_vehicle_ids(
+                vehicle_ids,
+                html_path=str(SAMPLE_HTML),
+                max_concurrency=3,
+                store_limit=None,
+                push_to_dataset=True,
+            )
+        )
+
+
+class ProcessVehicleIdsTests(unittest.TestCase):
+    def test_pushes_dataset_items_in_batches(self) -> None:
+        actor = _StubActor()
+        vehicle_ids = [str(idx) for idx in range(23)]
+        results, success_count, failures = _run(actor, vehicle_ids)
+        self.assertEqual([len(batch) for batch in actor.batches], [10, 10, 3])
+        self.assertEqual(success_count, 23)
+        self.assertEqual(failures, [])
+        self.assertEqual(
+            [item["data"]["url"].rsplit("/", 1)[1] for item in results], vehicle_ids
+        )
+
+    def test_failed_push_is_recorded_and_draining_continues(self) -> None:
+        actor = _StubActor(fail_first_push=True)
+        vehicle_ids = [str(idx) for idx in range(23)]
+        results, success_count, failures = _run(actor, vehicle_ids)
+        self.assertEqual([len(batch) for batch in actor.batches], [10, 10, 3])
+        self.assertEqual(success_count, 13)
+        self.assertEqual(len(failures), 10)
+        self.assertTrue(all("dataset unavailable" in error for _, error in failures))
+        self.assertEqual(len(results), 13)
+
+
+
+class UsableCpusTests(unittest.TestCase):
+    def _quota(self, content: str) -> Any:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cpu.max"
+            path.write_text(content)
+            return main._cgroup_cpu_quota(str(path))
+
+    def test_cgroup_quota_rounds_down_to_whole_cpus(self) -> None:
+        self.assertEqual(self._quota("400000 100000\n"), 4)
+        self.assertEqual(self._quota("150000 100000\n"), 1)
+        self.assertEqual(self._quota("50000 100000\n"), 1)
+
+    def test_unlimited_or_missing_quota_is_ignored(self) -> None:
+        self.assertIsNone(self._quota("max 100000\n"))
+        self.assertIsNone(main._cgroup_cpu_quota("/nonexistent/cpu.max"))
+
+    def test_quota_caps_usable_cpus(self) -> None:
+        with mock.patch.object(main, "_cgroup_cpu_quota", return_value=1):
+            self.assertEqual(main._usable_cpus(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
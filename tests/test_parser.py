@@ -1,7 +1,24 @@
+import asyncio
+import mmap
+import tempfile
 import unittest
 from pathlib import Path
+from typing import Any, Callable, List
 
-from parser import EncarParseError, extract_preloaded_state, parse_vehicle, validate_state
+import httpx
+
+from parser import (
+    EncarParseError,
+    build_output,
+    extract_preloaded_state,
+    format_engine,
+    parse_html,
+    parse_many,
+    parse_vehicle,
+    parse_vehicles,
+    to_english,
+    validate_state,
+)
 
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -10,13 +27,25 @@ SAMPLE_HTML = ROOT / "sample.html"
 
 class ParserTests(unittest.TestCase):
     def test_extract_preloaded_state_with_sample_html(self) -> None:
-        html = SAMPLE_HTML.read_text(encoding="utf-8")
+        html = SAMPLE_HTML.read_bytes()
         state = extract_preloaded_state(html)
         # Basic structure guards to detect breaking layout changes.
         self.assertIn("cars", state)
         self.assertIn("base", state.get("cars", {}))
         self.assertIn("advertisement", state.get("cars", {}).get("base", {}))
 
+    def test_extract_preloaded_state_from_mmap(self) -> None:
+        with SAMPLE_HTML.open("rb") as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                state = extract_preloaded_state(mapped)
+        self.assertEqual(state, extract_preloaded_state(SAMPLE_HTML.read_bytes()))
+
+    def test_extract_preloaded_state_accepts_text(self) -> None:
+        html = SAMPLE_HTML.read_bytes()
+        self.assertEqual(
+            extract_preloaded_state(html.decode("utf-8")), extract_preloaded_state(html)
+        )
+
     def test_parse_vehicle_from_sample_html(self) -> None:
         result = parse_vehicle("40849700", html_path=str(SAMPLE_HTML))
         self.assertIn("data", result)
@@ -25,6 +54,28 @@ class ParserTests(unittest.TestCase):
         self.assertTrue(data.get("url", "").endswith("/40849700"))
         self.assertIn("price", data)
         self.assertIn("mileage", data)
+        self.assertEqual(data["card_url"], data["url"])
+        self.assertEqual(data["fuel"], data["specifications"]["fuel_type"])
+
+    def test_parse_vehicle_accepts_integer_id(self) -> None:
+        result = parse_vehicle(40849700, html_path=str(SAMPLE_HTML))  # type: ignore[arg-type]
+        self.assertEqual(result["data"]["url"], "https://fem.encar.com/cars/detail/40849700")
+
+    def test_parse_vehicle_rereads_rewritten_page(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            page = Path(tmp) / "page.html"
+            page.write_bytes(SAMPLE_HTML.read_bytes())
+            self.assertIn("data", parse_vehicle("40849700", html_path=str(page)))
+            page.write_text("<script>__PRELOADED_STATE__ = {bad-json}</script>")
+            with self.assertRaises(EncarParseError):
+                parse_vehicle("40849700", html_path=str(page))
+
+    def test_parse_many_keeps_input_order(self) -> None:
+        results = parse_many([("1", str(SAMPLE_HTML)), ("2", str(SAMPLE_HTML))], max_workers=1)
+        self.assertEqual(
+            [result["data"]["url"] for result in results],
+            ["https://fem.encar.com/cars/detail/1", "https://fem.encar.com/cars/detail/2"],
+        )
 
     def test_extract_preloaded_state_missing_marker(self) -> None:
         html = "<html><body><script>console.log('no state here');</script></body></html>"
@@ -36,6 +87,81 @@ class ParserTests(unittest.TestCase):
         with self.assertRaises(EncarParseError):
             extract_preloaded_state(html)
 
+    def test_extract_preloaded_state_braces_in_strings(self) -> None:
+        html = (
+            '<script>window.__PRELOADED_STATE__ = {"a": "}{", "b": {"c": "\\"}"}};'
+            "window.other = {};</script>"
+        )
+        state = extract_preloaded_state(html)
+        self.assertEqual(state, {"a": "}{", "b": {"c": '"}'}})
+
+    def test_extract_preloaded_state_semicolon_in_string(self) -> None:
+        html = '<script>__PRELOADED_STATE__ = {"js": "f()};", "n": 1};</script>'
+        state = extract_preloaded_state(html)
+        self.assertEqual(state, {"js": "f()};", "n": 1})
+
+    def test_build_output_omits_missing_fields(self) -> None:
+        base = {
+            "category": {"manufacturerName": "기아"},
+            "advertisement": {"price": None},
+            "spec": {"seatCount": 5},
+            "manage": {},
+            "condition": {"seizing": None},
+            "detailFlags": None,
+        }
+        data = build_output("123", validate_state({"cars": {"base": base}}))
+        self.assertEqual(
+            data,
+            {
+                "id": "123",
+                "make": "기아",
+                "url": "https://fem.encar.com/cars/detail/123",
+                "card_url": "https://fem.encar.com/cars/detail/123",
+                "specifications": {"seats": 5},
+            },
+        )
+
+    def test_build_output_ignores_wrongly_typed_nested_objects(self) -> None:
+        base = {
+            "category": {"manufacturerName": "기아"},
+            "advertisement": {},
+            "spec": {},
+            "manage": {},
+            "condition": {"seizing": [1], "accident": "none"},
+            "detailFlags": "x",
+        }
+        data = build_output("123", validate_state({"cars": {"base": base}}))
+        self.assertNotIn("condition", data)
+        self.assertNotIn("metrics", data)
+
+    def test_parse_html_rejects_wrongly_typed_values(self) -> None:
+        html = (
+            '<script>__PRELOADED_STATE__ = {"cars": {"base": {"category": {}, '
+            '"advertisement": {}, "spec": {"colorName": ["a"]}}}}</script>'
+        )
+        with self.assertRaises(EncarParseError):
+            parse_html(html, "123")
+
+    def test_format_engine_rounds_to_tenths(self) -> None:
+        self.assertEqual(format_engine(1998), "2L")
+        self.assertEqual(format_engine(2497), "2.5L")
+        self.assertEqual(format_engine(1591), "1.6L")
+        self.assertIsNone(format_engine(0))
+        self.assertIsNone(format_engine(None))
+
+    def test_to_english(self) -> None:
+        self.assertEqual(to_english(" 검정색 "), "Black")
+        self.assertEqual(to_english("Pearl White"), "Pearl White")
+        self.assertTrue(to_english("진주색").isascii())
+        self.assertIsNone(to_english(""))
+
+    def test_extract_preloaded_state_skips_non_assignment(self) -> None:
+        html = (
+            "<script>window.__PRELOADED_STATE__ || (x = {\"b\": 2});</script>"
+            '<script>window.__PRELOADED_STATE__ = {"a": 1};init();</script>'
+        )
+        self.assertEqual(extract_preloaded_state(html), {"a": 1})
+
     def test_validate_state_missing_base(self) -> None:
         with self.assertRaises(EncarParseError):
             validate_state({})
@@ -46,5 +172,55 @@ class ParserTests(unittest.TestCase):
             validate_state(state)
 
 
+def _run_parse_vehicles(
+    handler: Callable[[httpx.Request], httpx.Response], vehicle_ids: List[str]
+) -> List[Any]:
+    async def run() -> List[Any]:
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport, follow_redirects=True) as client:
+            return await parse_vehicles(vehicle_ids, concurrency=2, client=client)
+
+    return asyncio.run(run())
+
+
+class ParseVehiclesTests(unittest.TestCase):
+    def test_results_follow_input_order(self) -> None:
+        html = SAMPLE_HTML.read_bytes()
+        results = _run_parse_vehicles(
+            lambda request: httpx.Response(200, content=html), ["3", "1", "2"]
+        )
+        self.assertEqual(
+            [result["data"]["url"].rsplit("/", 1)[1] for result in results], ["3", "1", "2"]
+        )
+
+    def test_failed_vehicle_yields_its_exception(self) -> None:
+        html = SAMPLE_HTML.read_bytes()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/404"):
+                return httpx.Response(404)
+            return httpx.Response(200, content=html)
+
+        ok, missing = _run_parse_vehicles(handler, ["1", "404"])
+        self.assertIn("data", ok)
+        self.assertIsInstance(missing, httpx.HTTPStatusError)
+        self.assertEqual(missing.response.status_code, 404)
+
+    def test_retries_unavailable_response(self) -> None:
+        html = SAMPLE_HTML.read_bytes()
+        calls: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if len(calls) == 1:
+                # Retry-After: 0 keeps the retry from sleeping through the backoff.
+                return httpx.Response(503, headers={"Retry-After": "0"})
+            return httpx.Response(200, content=html)
+
+        (result,) = _run_parse_vehicles(handler, ["1"])
+        self.assertIn("data", result)
+        self.assertEqual(calls, ["/cars/detail/1", "/cars/detail/1"])
+
+
 if __name__ == "__main__":
     unittest.main()